@@ -0,0 +1,105 @@
+"""
+Compiled single-target Dijkstra core.
+
+Runs over flat CSR arrays (indptr / indices / weights) with a hand-rolled
+4-ary min-heap kept in two parallel numpy arrays, so Numba can compile the
+whole loop to machine code. Instead of decrease-key we push duplicates and
+filter stale pops with a visited bitset -- the "no decrease-key" heap
+variant, which beats fancier heaps in practice.
+
+Numba is optional: without it the same function runs as plain Python over the
+numpy arrays, which is slow but correct.
+"""
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+HAVE_NUMBA = njit is not None
+
+
+def _dijkstra_impl(indptr, indices, weights, source, target):
+    n = indptr.shape[0] - 1
+    dist = np.full(n, np.inf)
+    pred = np.full(n, -1, dtype=np.int32)
+    visited = np.zeros(n, dtype=np.bool_)
+
+    # 4-ary min-heap in parallel arrays; each dist improvement pushes one
+    # entry, so E + 1 slots can never overflow
+    heap_cost = np.empty(indices.shape[0] + 1)
+    heap_node = np.empty(indices.shape[0] + 1, dtype=np.int32)
+    heap_cost[0] = 0.0
+    heap_node[0] = source
+    size = 1
+    dist[source] = 0.0
+
+    while size > 0:
+        # Pop the root, move the last leaf up and sift it down
+        cost = heap_cost[0]
+        node = heap_node[0]
+        size -= 1
+        if size > 0:
+            c = heap_cost[size]
+            v = heap_node[size]
+            i = 0
+            while True:
+                first = 4 * i + 1
+                if first >= size:
+                    break
+                if first + 3 < size:
+                    # All four children present: pick the min branchlessly,
+                    # adding comparison results to indices so the compiler
+                    # can emit conditional moves instead of jumps
+                    left = first + (heap_cost[first + 1] < heap_cost[first])
+                    right = first + 2 + (heap_cost[first + 3] < heap_cost[first + 2])
+                    child = left if heap_cost[left] <= heap_cost[right] else right
+                else:
+                    child = first
+                    for k in range(first + 1, size):
+                        if heap_cost[k] < heap_cost[child]:
+                            child = k
+                if heap_cost[child] >= c:
+                    break
+                heap_cost[i] = heap_cost[child]
+                heap_node[i] = heap_node[child]
+                i = child
+            heap_cost[i] = c
+            heap_node[i] = v
+
+        if visited[node]:
+            continue
+        visited[node] = True
+
+        if node == target:
+            return cost, pred
+
+        for e in range(indptr[node], indptr[node + 1]):
+            neighbor = indices[e]
+            if visited[neighbor]:
+                continue
+            new_cost = cost + weights[e]
+            if new_cost < dist[neighbor]:
+                dist[neighbor] = new_cost
+                pred[neighbor] = node
+                # Push by sifting the new entry up from the bottom
+                i = size
+                size += 1
+                while i > 0:
+                    parent = (i - 1) // 4
+                    if heap_cost[parent] <= new_cost:
+                        break
+                    heap_cost[i] = heap_cost[parent]
+                    heap_node[i] = heap_node[parent]
+                    i = parent
+                heap_cost[i] = new_cost
+                heap_node[i] = neighbor
+
+    return np.inf, pred
+
+
+if HAVE_NUMBA:
+    dijkstra_csr = njit(cache=True)(_dijkstra_impl)
+else:
+    dijkstra_csr = _dijkstra_impl
@@ -0,0 +1,53 @@
+"""
+Minimal 4-ary min-heap in the Structure-of-Arrays style.
+
+The queue is two flat parallel arrays -- float costs and int node ids --
+instead of a Python list of (cost, node) tuples, so a push allocates no
+tuple and sifts move machine-width scalars instead of pointers. Children of
+index i live at 4*i + 1 .. 4*i + 4, half the depth of a binary heap.
+"""
+from array import array
+
+def new():
+    """Returns the (costs, nodes) array pair making up an empty heap."""
+    return array('d'), array('l')
+
+def push(costs, nodes, cost, node):
+    costs.append(cost)
+    nodes.append(node)
+    i = len(costs) - 1
+    while i > 0:
+        parent = (i - 1) >> 2
+        if costs[parent] <= cost:
+            break
+        costs[i] = costs[parent]
+        nodes[i] = nodes[parent]
+        i = parent
+    costs[i] = cost
+    nodes[i] = node
+
+def pop(costs, nodes):
+    last_cost = costs.pop()
+    last_node = nodes.pop()
+    if not costs:
+        return last_cost, last_node
+    top = (costs[0], nodes[0])
+    size = len(costs)
+    i = 0
+    while True:
+        child = 4 * i + 1
+        if child >= size:
+            break
+        # smallest of up to four children
+        end = min(child + 4, size)
+        for c in range(child + 1, end):
+            if costs[c] < costs[child]:
+                child = c
+        if costs[child] >= last_cost:
+            break
+        costs[i] = costs[child]
+        nodes[i] = nodes[child]
+        i = child
+    costs[i] = last_cost
+    nodes[i] = last_node
+    return top